@@ -10,14 +10,219 @@ Usage:
 """
 
 import argparse
+import functools
 import os
+import shutil
+import socket
 import sys
 import subprocess
-import yaml
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from loguru import logger
 
+try:
+    from . import yaml_cache
+except ImportError:
+    import yaml_cache
+
+# Python-UNO bridge shipped with LibreOffice (optional, used for the persistent server)
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+# Try different common LibreOffice executable names and paths
+LIBREOFFICE_COMMANDS = [
+    'libreoffice',
+    'soffice',
+    r'C:\Program Files\LibreOffice\program\soffice.exe',
+    r'C:\Program Files (x86)\LibreOffice\program\soffice.exe'
+]
+
+# LibreOffice executable that last converted successfully
+_libreoffice_cmd: Optional[str] = None
+
+# Lock shared by concurrent build pipelines (see build_books) so that only one
+# LibreOffice conversion runs at a time. None when building in a single process.
+_pdf_lock = None
+
+
+def set_pdf_lock(lock) -> None:
+    """
+    Set the lock used to serialize LibreOffice conversions across processes.
+    
+    Args:
+        lock: A multiprocessing lock, or None to disable serialization
+    """
+    global _pdf_lock
+    _pdf_lock = lock
+
+
+# Persistent headless LibreOffice instance, see start_libreoffice_server()
+_lo_server: Optional[subprocess.Popen] = None
+_lo_profile_dir: Optional[str] = None
+_lo_desktop = None
+
+
+def _debug_enabled() -> bool:
+    """Return True if any loguru sink accepts DEBUG records."""
+    # loguru has no public accessor for the lowest level handled by its sinks. If the
+    # private attribute goes away, assume DEBUG is wanted (the behaviour before this check).
+    min_level = getattr(getattr(logger, '_core', None), 'min_level', 0)
+    return min_level <= logger.level("DEBUG").no
+
+
+def _decode(output: bytes) -> str:
+    """Decode captured subprocess output for logging."""
+    return output.decode('utf-8', errors='replace')
+
+
+def _libreoffice_candidates() -> List[str]:
+    """
+    Return the LibreOffice executables to try, resolved with shutil.which so that
+    missing ones are skipped without spawning a process.
+    
+    Returns:
+        The cached executable if one already worked, otherwise all installed candidates
+    """
+    if _libreoffice_cmd is not None:
+        return [_libreoffice_cmd]
+    return [path for path in map(shutil.which, LIBREOFFICE_COMMANDS) if path]
+
+
+def _uno_properties(**kwargs) -> tuple:
+    """Build a tuple of UNO PropertyValue from keyword arguments."""
+    return tuple(PropertyValue(Name=name, Value=value) for name, value in kwargs.items())
+
+
+def start_libreoffice_server(timeout: float = 30.0) -> bool:
+    """
+    Start a headless LibreOffice instance accepting UNO connections, so that several
+    PDF conversions share one start-up instead of cold-launching soffice each time.
+    
+    Args:
+        timeout: Seconds to wait for the instance to accept connections
+    
+    Returns:
+        True if the server is running and connected, False otherwise
+    """
+    global _lo_server, _lo_profile_dir, _lo_desktop
+    
+    if uno is None:
+        logger.debug("Python-UNO not available, LibreOffice will be started per conversion")
+        return False
+    
+    # Pick a free local port
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    
+    # Private user profile so we don't clash with a LibreOffice the user has open
+    _lo_profile_dir = tempfile.mkdtemp(prefix='lo_prof_')
+    
+    for cmd_base in _libreoffice_candidates():
+        cmd = [
+            cmd_base,
+            '--headless',
+            '--norestore',
+            '--nologo',
+            '--nodefault',
+            f'--accept=socket,host=127.0.0.1,port={port};urp;',
+            f'-env:UserInstallation={Path(_lo_profile_dir).as_uri()}'
+        ]
+        try:
+            _lo_server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            break
+        except FileNotFoundError:
+            logger.debug(f"LibreOffice not found at: {cmd_base}")
+    else:
+        stop_libreoffice_server()
+        return False
+    
+    try:
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', local_context)
+    except Exception:
+        stop_libreoffice_server()
+        raise
+    url = f'uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext'
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and _lo_server.poll() is None:
+        try:
+            context = resolver.resolve(url)
+            _lo_desktop = context.ServiceManager.createInstanceWithContext(
+                'com.sun.star.frame.Desktop', context)
+            logger.info(f"Started LibreOffice server on port {port}")
+            return True
+        except Exception:
+            # Not accepting connections yet
+            time.sleep(0.25)
+    
+    logger.warning("LibreOffice server did not start, falling back to one process per conversion")
+    stop_libreoffice_server()
+    return False
+
+
+def stop_libreoffice_server() -> None:
+    """Shut down the LibreOffice instance started by start_libreoffice_server()."""
+    global _lo_server, _lo_profile_dir, _lo_desktop
+    
+    if _lo_desktop is not None:
+        try:
+            _lo_desktop.terminate()
+        except Exception:
+            # The connection drops while LibreOffice exits
+            pass
+        _lo_desktop = None
+    
+    if _lo_server is not None:
+        try:
+            _lo_server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _lo_server.kill()
+            _lo_server.wait()
+        _lo_server = None
+    
+    if _lo_profile_dir is not None:
+        shutil.rmtree(_lo_profile_dir, ignore_errors=True)
+        _lo_profile_dir = None
+
+
+def _convert_pdf_uno(input_file: Path, output_dir: Path) -> bool:
+    """
+    Convert ODT to PDF through the persistent LibreOffice server.
+    
+    Args:
+        input_file: Input ODT file
+        output_dir: Output directory for PDF
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    pdf_file = output_dir / (input_file.stem + '.pdf')
+    try:
+        document = _lo_desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(input_file.resolve())), '_blank', 0,
+            _uno_properties(Hidden=True))
+        try:
+            document.storeToURL(uno.systemPathToFileUrl(str(pdf_file.resolve())),
+                                _uno_properties(FilterName='writer_pdf_Export'))
+        finally:
+            document.close(True)
+    except Exception as e:
+        logger.error(f"Error converting {input_file} with the LibreOffice server: {e}")
+        return False
+    
+    logger.info(f"Converted with LibreOffice server: {input_file}")
+    return True
+
 
 def run_pandoc_odt(input_file: Path, output_file: Path, template_file: Path, 
                    pandoc_options: List[str], resource_path: str = "") -> bool:
@@ -39,30 +244,38 @@ def run_pandoc_odt(input_file: Path, output_file: Path, template_file: Path,
         str(input_file),
         f'--reference-doc={template_file}',
         f'--output={output_file}',
-        '--verbose', 
         '--embed-resources', 
     ]
     
+    # Pandoc's verbose report is only worth producing if it can be logged
+    debug = _debug_enabled()
+    if debug:
+        cmd.append('--verbose')
+    
     if resource_path:
         cmd.append(f'--resource-path={resource_path}')
     
     cmd.extend(pandoc_options)
     
-    logger.info(f"Running: {' '.join(cmd)}")
+    logger.opt(lazy=True).info("Running: {}", lambda: ' '.join(cmd))
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        if result.stdout:
-            logger.debug(f"Pandoc output: {result.stdout}")
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error running Pandoc: {e}")
-        if e.stderr:
-            logger.error(f"Pandoc error: {e.stderr}")
-        return False
+        # Only keep stdout when it will be logged; stderr is decoded on failure only
+        result = subprocess.run(cmd, stdout=subprocess.PIPE if debug else subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
     except FileNotFoundError:
         logger.error("Error: Pandoc not found. Please install Pandoc.")
         return False
+    
+    if result.returncode != 0:
+        logger.error(f"Error running Pandoc: exit status {result.returncode}")
+        if result.stderr:
+            logger.error(f"Pandoc error: {_decode(result.stderr)}")
+        return False
+    
+    if result.stdout:
+        logger.debug(f"Pandoc output: {_decode(result.stdout)}")
+    return True
 
 
 def run_libreoffice_pdf(input_file: Path, output_dir: Path) -> bool:
@@ -77,69 +290,105 @@ def run_libreoffice_pdf(input_file: Path, output_dir: Path) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    # Try different common LibreOffice executable names and paths
-    libreoffice_commands = [
-        'libreoffice',
-        'soffice',
-        r'C:\Program Files\LibreOffice\program\soffice.exe',
-        r'C:\Program Files (x86)\LibreOffice\program\soffice.exe'
-    ]
-
-    for cmd_base in libreoffice_commands:
-        cmd = [
-            cmd_base,
-            '--headless',
-            f'--convert-to',
-            'pdf:writer_pdf_Export',
-            str(input_file),
-            f'--outdir',
-            str(output_dir)
-        ]
+    global _libreoffice_cmd
+    
+    debug = _debug_enabled()
+    
+    with _pdf_lock if _pdf_lock is not None else nullcontext():
+        # Use the persistent LibreOffice server if one is running
+        if _lo_desktop is not None and _convert_pdf_uno(input_file, output_dir):
+            return True
         
-        logger.debug(f"Trying: {' '.join(cmd)}")
+        for cmd_base in _libreoffice_candidates():
+            cmd = [
+                cmd_base,
+                '--headless',
+                f'--convert-to',
+                'pdf:writer_pdf_Export',
+                str(input_file),
+                f'--outdir',
+                str(output_dir)
+            ]
         
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            logger.info(f"Executed: {' '.join(cmd)}")
-            if result.stdout:
-                logger.debug(f"LibreOffice output: {result.stdout}")
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error running LibreOffice with {cmd_base}: {e}")
-            if e.stderr:
-                logger.error(f"LibreOffice error: {e.stderr}")
+            logger.opt(lazy=True).debug("Trying: {}", lambda: ' '.join(cmd))
+        
+            try:
+                result = subprocess.run(cmd, stdout=subprocess.PIPE if debug else subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE)
+            except FileNotFoundError:
+                logger.debug(f"LibreOffice not found at: {cmd_base}")
+                continue
+            
+            if result.returncode == 0:
+                logger.opt(lazy=True).info("Executed: {}", lambda: ' '.join(cmd))
+                if result.stdout:
+                    logger.debug(f"LibreOffice output: {_decode(result.stdout)}")
+                _libreoffice_cmd = cmd_base
+                return True
+            
+            logger.error(f"Error running LibreOffice with {cmd_base}: exit status {result.returncode}")
+            if result.stderr:
+                logger.error(f"LibreOffice error: {_decode(result.stderr)}")
             
             # Check if PDF was created despite the error
             pdf_file = output_dir / (input_file.stem + '.pdf')
             if pdf_file.exists():
                 logger.info(f"PDF was created successfully despite exit code: {pdf_file}")
+                _libreoffice_cmd = cmd_base
                 return True
             # If PDF wasn't created, continue to next command
-            continue
-            
-        except FileNotFoundError:
-            logger.debug(f"LibreOffice not found at: {cmd_base}")
-            continue
     
     logger.error("Error: LibreOffice not found. Please install LibreOffice or add it to PATH.")
     logger.warning("Continuing without PDF generation...")
     return False
 
 
-def build_volume(volume_name: str, volume_config: Dict[str, Any], 
-                input_dir: Path, output_dir: Path) -> bool:
+@functools.lru_cache(maxsize=None)
+def _resolve_pandoc_options(devops_dir: Path) -> Tuple[str, ...]:
     """
-    Build a single volume (markdown -> ODT -> PDF).
+    Build the Pandoc options, resolving relative filter paths against devops/filters.
+    Cached: the result only depends on devops_dir, which is constant within a run.
+    
+    Args:
+        devops_dir: The devops directory
+    
+    Returns:
+        Tuple of resolved Pandoc options
+    """
+    # Get Pandoc options and resolve filter paths
+    pandoc_options = [
+        "--lua-filter=odt-custom-styles.lua",
+        "--lua-filter=odt-bib-style.lua",
+        "--lua-filter=fodt-include.lua",
+    ]
+    
+    # Resolve relative paths in pandoc options
+    resolved_options = []
+    for option in pandoc_options:
+        if option.startswith('--lua-filter=') and not option.startswith('--lua-filter=/'):
+            # Resolve relative filter path
+            filter_path = option.replace('--lua-filter=', '')
+            resolved_filter_path = devops_dir/ 'filters' / filter_path
+            resolved_options.append(f'--lua-filter={resolved_filter_path}')
+        else:
+            resolved_options.append(option)
+    
+    return tuple(resolved_options)
+
+
+def build_volume_odt(volume_name: str, volume_config: Dict[str, Any], 
+                     input_dir: Path, output_dir: Path) -> Optional[Path]:
+    """
+    Convert a single volume from markdown to ODT with Pandoc.
     
     Args:
         volume_name: Name of the volume
         volume_config: Volume configuration
         input_dir: Input directory containing processed markdown
         output_dir: Output directory for final files
-        config: Global configuration
     
     Returns:
-        True if successful, False otherwise
+        Path to the ODT file if successful, None otherwise
     """
     
     # Get paths - resolve relative to the project root
@@ -150,38 +399,21 @@ def build_volume(volume_name: str, volume_config: Dict[str, Any],
     
     if not template_file.exists():
         logger.error(f"Error: Template file {template_file} not found")
-        return False
+        return None
     
     # Input and output files
     input_file = input_dir / f"{volume_name}.md"
     if not input_file.exists():
         logger.error(f"Error: Input file {input_file} not found")
-        return False
+        return None
     
     output_name = volume_config.get('output_name', volume_name)
     odt_file = output_dir / f"{output_name}.odt"
-    pdf_file = output_dir / f"{output_name}.pdf"
     
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Get Pandoc options and resolve filter paths
-    pandoc_options = [
-        "--lua-filter=odt-custom-styles.lua",
-        "--lua-filter=odt-bib-style.lua",
-        "--lua-filter=fodt-include.lua",
-    ]
-    
-    # Resolve relative paths in pandoc options
-    resolved_options = []
-    for option in pandoc_options:
-        if option.startswith('--lua-filter=') and not option.startswith('--lua-filter=/'):
-            # Resolve relative filter path
-            filter_path = option.replace('--lua-filter=', '')
-            resolved_filter_path = devops_dir/ 'filters' / filter_path
-            resolved_options.append(f'--lua-filter={resolved_filter_path}')
-        else:
-            resolved_options.append(option)
+    resolved_options = list(_resolve_pandoc_options(devops_dir))
 
     resource_path = current_dir / 'resources'
 
@@ -190,17 +422,54 @@ def build_volume(volume_name: str, volume_config: Dict[str, Any],
     # Convert to ODT
     logger.info(f"Converting {input_file} to ODT...")
     if not run_pandoc_odt(input_file, odt_file, template_file, resolved_options, resource_path):
-        return False
+        return None
     
     logger.success(f"Created: {odt_file}")
+    return odt_file
+
+
+def build_volume_pdf(odt_file: Path, output_dir: Path) -> bool:
+    """
+    Convert a volume ODT to PDF with LibreOffice.
+    
+    Args:
+        odt_file: ODT file produced by build_volume_odt()
+        output_dir: Output directory for final files
+    
+    Returns:
+        True if the PDF was created, False otherwise
+    """
+    pdf_file = output_dir / f"{odt_file.stem}.pdf"
     
-    # Convert to PDF
     logger.info(f"Converting {odt_file} to PDF...")
     if run_libreoffice_pdf(odt_file, output_dir):
         logger.success(f"Created: {pdf_file}")
-    else:
-        logger.warning(f"Warning: PDF generation failed, but ODT file was created successfully: {odt_file}")
+        return True
+    
+    logger.warning(f"Warning: PDF generation failed, but ODT file was created successfully: {odt_file}")
+    return False
+
+
+def build_volume(volume_name: str, volume_config: Dict[str, Any], 
+                input_dir: Path, output_dir: Path) -> bool:
+    """
+    Build a single volume (markdown -> ODT -> PDF).
+    
+    Args:
+        volume_name: Name of the volume
+        volume_config: Volume configuration
+        input_dir: Input directory containing processed markdown
+        output_dir: Output directory for final files
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    odt_file = build_volume_odt(volume_name, volume_config, input_dir, output_dir)
+    if odt_file is None:
+        return False
     
+    # A failed PDF conversion still leaves a usable ODT
+    build_volume_pdf(odt_file, output_dir)
     return True
 
 
@@ -233,8 +502,7 @@ def main(args: Optional[List[str]] = None) -> int:
             return 1
         
 
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = yaml_cache.load_yaml_cached(config_path)
         
         # Set up directories
         default_output = 'build'
@@ -260,10 +528,38 @@ def main(args: Optional[List[str]] = None) -> int:
                 return 1
             success = build_volume(parsed_args.vol, volumes[parsed_args.vol], input_dir, output_dir)
         else:
-            # Build all volumes
-            for volume_name, volume_config in volumes.items():
-                if not build_volume(volume_name, volume_config, input_dir, output_dir):
-                    success = False
+            # Build all volumes: Pandoc runs concurrently (one subprocess per volume),
+            # while LibreOffice converts the ODTs one at a time as they become ready
+            try:
+                workers = min(len(volumes), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as odt_executor, \
+                        ThreadPoolExecutor(max_workers=1) as pdf_executor:
+                    server_future = None
+                    if len(volumes) > 1:
+                        # Start the shared LibreOffice instance while Pandoc runs; the PDF
+                        # conversions queue behind it on the single PDF worker
+                        server_future = pdf_executor.submit(start_libreoffice_server)
+                    odt_futures = [
+                        odt_executor.submit(build_volume_odt, volume_name, volume_config, input_dir, output_dir)
+                        for volume_name, volume_config in volumes.items()
+                    ]
+                    if server_future is not None:
+                        # Report a failed start before any PDF conversion is queued
+                        try:
+                            server_future.result()
+                        except Exception as e:
+                            logger.warning(f"Could not start LibreOffice server, falling back to one process per conversion: {e}")
+                    pdf_futures = []
+                    for future in as_completed(odt_futures):
+                        odt_file = future.result()
+                        if odt_file is None:
+                            success = False
+                            continue
+                        pdf_futures.append(pdf_executor.submit(build_volume_pdf, odt_file, output_dir))
+                    for future in pdf_futures:
+                        future.result()
+            finally:
+                stop_libreoffice_server()
         
         return 0 if success else 1
         
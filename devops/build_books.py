@@ -10,9 +10,13 @@ Usage:
 """
 
 import argparse
+import multiprocessing
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from typing import List, Optional
 from loguru import logger
 
 # Add devops directory to path so we can import our modules
@@ -22,10 +26,84 @@ import merge
 import entitize
 import customize
 import build
+import yaml_cache
 
 
-def main():
-    """Main function for the build-books script."""
+def run_pipeline_for_volume(volume: str, config_file: Path, styles_file: Path, entities_file: Path,
+                            input_dir: Path, obj_dir: Path, final_output_dir: Path) -> int:
+    """
+    Run the complete pipeline (merge -> entitize -> customize -> build) for one volume.
+    
+    Args:
+        volume: Name of the volume
+        config_file: Path to volumes.yaml
+        styles_file: Path to styles.yaml
+        entities_file: Path to the name entities file
+        input_dir: Project root containing the volume content
+        obj_dir: Temporary directory
+        final_output_dir: Output directory for the final documents
+    
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    unicode_dir = obj_dir / 'unicode'
+    custom_dir = obj_dir / 'custom'
+    
+    # Step 1: Merge content
+    logger.info(f"Step 1: Merging markdown files for {volume}...")
+    merge_args = [str(config_file), '--output', str(obj_dir), '--input', str(input_dir), '-vol', volume]
+    
+    if merge.main(merge_args) != 0:
+        logger.error(f"Error in merge step for {volume}")
+        return 1
+    
+    # Step 2: Entity replacement
+    logger.info(f"Step 2: Replacing entities for {volume}...")
+    merged_file = obj_dir / f"{volume}.md"
+    if not merged_file.exists():
+        logger.error(f"Error: No merged file found to process for {volume}")
+        return 1
+    
+    entitize_args = [str(entities_file), str(merged_file), '--output', str(unicode_dir)]
+    
+    if entitize.main(entitize_args) != 0:
+        logger.error(f"Error in entitize step for {volume}")
+        return 1
+    
+    # Step 3: Apply custom styles
+    logger.info(f"Step 3: Applying custom styles for {volume}...")
+    unicode_file = unicode_dir / f"{volume}.md"
+    if not unicode_file.exists():
+        logger.error(f"Error: No unicode file found to process for {volume}")
+        return 1
+    
+    customize_args = [str(styles_file), str(unicode_file), '--output', str(custom_dir)]
+    
+    if customize.main(customize_args) != 0:
+        logger.error(f"Error in customize step for {volume}")
+        return 1
+    
+    # Step 4: Build final documents
+    logger.info(f"Step 4: Building final documents (ODT and PDF) for {volume}...")
+    build_args = [str(config_file), '--input', str(custom_dir), '--output', str(final_output_dir), '-vol', volume]
+    
+    if build.main(build_args) != 0:
+        logger.error(f"Error in build step for {volume}")
+        return 1
+    
+    return 0
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Main function for the build-books script.
+    
+    Args:
+        args: Command line arguments. If None, uses sys.argv
+    
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
     parser = argparse.ArgumentParser(description='Build books from markdown content')
     parser.add_argument('volume_list', help='Path to volumes.yaml file')
     parser.add_argument('styles', help='Path to styles.yaml file')
@@ -36,22 +114,23 @@ def main():
     parser.add_argument('--temp', default='obj',
                        help='Temporary directory (default: obj)')
 
-    args = parser.parse_args()
+    if args is None:
+        args = sys.argv[1:]
+    
+    parsed_args = parser.parse_args(args)
     
     # Set up paths
     current_dir = Path.cwd()
-    config_file = Path(args.volume_list)
-    styles_file = Path(args.styles)
-    entities_file = Path(args.name_list)
+    config_file = Path(parsed_args.volume_list)
+    styles_file = Path(parsed_args.styles)
+    entities_file = Path(parsed_args.name_list)
     
     # Create obj directories
-    obj_dir = Path(args.temp)
+    obj_dir = Path(parsed_args.temp)
     obj_dir.mkdir(parents=True, exist_ok=True)
-    unicode_dir = obj_dir / 'unicode'
-    custom_dir = obj_dir / 'custom'
 
     # Output directory
-    final_output_dir = Path(args.output)
+    final_output_dir = Path(parsed_args.output)
     final_output_dir.mkdir(parents=True, exist_ok=True)
 
 
@@ -60,78 +139,36 @@ def main():
     logger.info(f"Config files: {config_file}, {styles_file}, {entities_file}")
     logger.info(f"Output directory: {final_output_dir}")
     logger.info(f"Temp directory: {obj_dir}")
-    if args.vol:
-        logger.info(f"Building volume: {args.vol}")
+    if parsed_args.vol:
+        logger.info(f"Building volume: {parsed_args.vol}")
+        volumes = [parsed_args.vol]
     else:
         logger.info("Building all volumes")
+        if not config_file.exists():
+            logger.error(f"Error: Configuration file {config_file} not found")
+            return 1
+        volumes = list((yaml_cache.load_yaml_cached(config_file) or {}).get('volumes', {}))
+        if not volumes:
+            logger.error("Error: No volumes found in configuration")
+            return 1
     logger.info("")
     
-    # Step 1: Merge content
-    logger.info("Step 1: Merging markdown files...")
-    merge_args = [str(config_file), '--output', str(obj_dir), '--input', str(current_dir)]
-    if args.vol:
-        merge_args.extend(['-vol', args.vol])
-
-    if merge.main(merge_args) != 0:
-        logger.error("Error in merge step")
-        return 1
-    logger.info("")
-    
-    # Step 2: Entity replacement
-    logger.info("Step 2: Replacing entities...")
-    
-    # Find merged files to process
-    merged_files = []
-    if args.vol:
-        merged_file = obj_dir / f"{args.vol}.md"
-        if merged_file.exists():
-            merged_files.append(str(merged_file))
+    pipeline_args = (config_file, styles_file, entities_file, current_dir, obj_dir, final_output_dir)
+    
+    if len(volumes) > 1:
+        # Volumes are independent (distinct inputs and outputs): run one pipeline per
+        # worker process. LibreOffice conversions share a lock so that only one
+        # soffice instance runs at a time, while the other steps overlap.
+        workers = min(len(volumes), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=build.set_pdf_lock,
+                                 initargs=(multiprocessing.Lock(),)) as executor:
+            results = list(executor.map(run_pipeline_for_volume, volumes,
+                                        *(repeat(arg) for arg in pipeline_args)))
     else:
-        merged_files = [str(f) for f in obj_dir.glob('*.md')]
-    
-    if not merged_files:
-        logger.error("Error: No merged files found to process")
-        return 1
+        results = [run_pipeline_for_volume(volumes[0], *pipeline_args)]
     
-    entitize_args = [str(entities_file)] + merged_files + ['--output', str(unicode_dir)]
-    
-    if entitize.main(entitize_args) != 0:
-        logger.error("Error in entitize step")
-        return 1
-    logger.info("")
-    
-    # Step 3: Apply custom styles
-    logger.info("Step 3: Applying custom styles...")
-    
-    # Find unicode files to process
-    unicode_files = []
-    if args.vol:
-        unicode_file = unicode_dir / f"{args.vol}.md"
-        if unicode_file.exists():
-            unicode_files.append(str(unicode_file))
-    else:
-        unicode_files = [str(f) for f in unicode_dir.glob('*.md')]
-    
-    if not unicode_files:
-        logger.error("Error: No unicode files found to process")
-        return 1
-    
-    customize_args = [str(styles_file)] + unicode_files + ['--output', str(custom_dir)]
-    
-    if customize.main(customize_args) != 0:
-        logger.error("Error in customize step")
-        return 1
-    logger.info("")
-    
-    # Step 4: Build final documents
-    logger.info("Step 4: Building final documents (ODT and PDF)...")
-    
-    build_args = [str(config_file), '--input', str(custom_dir), '--output', str(final_output_dir)]
-    if args.vol:
-        build_args.extend(['-vol', args.vol])
-    
-    if build.main(build_args) != 0:
-        logger.error("Error in build step")
+    if any(results):
+        logger.error("Error: Build failed")
         return 1
     logger.info("")
     
@@ -11,39 +11,60 @@ Usage:
 
 import argparse
 import os
+import shutil
 import sys
 import re
-import yaml
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from loguru import logger
 
+try:
+    from . import yaml_cache
+except ImportError:
+    import yaml_cache
 
-def load_styles(styles_file: Path) -> Dict[str, Any]:
+# Backreferences (\1, (?P=name)) would point at the wrong group once the
+# patterns are wrapped in a single alternation
+_BACKREF_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+# A fenced block starts on a line beginning with ':::' and runs up to the next line
+# that is exactly ':::' (or to the end of the file if it is never closed). Lines end at
+# every separator str.splitlines() recognises, not only '\n' (\r is normalised away first).
+_LINE_SEP = '\n\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+_FENCE_RE = re.compile(
+    r'(?:\A|(?<=[{sep}]))[^\S{sep}]*:::[^{sep}]*(?:[{sep}]|\Z)'
+    r'(?:.*?(?<=[{sep}])[^\S{sep}]*:::[^\S{sep}]*(?:[{sep}]|\Z)|.*)'.format(sep=_LINE_SEP),
+    re.DOTALL
+)
+
+
+def load_styles(styles_file: Path) -> List[Tuple[str, re.Pattern, str]]:
     """
-    Load style definitions from a YAML file.
+    Load style definitions from a YAML file and compile their patterns.
+    Invalid patterns are reported once here and left out of the result.
     
     Args:
         styles_file: Path to the styles YAML file
     
     Returns:
-        Dictionary containing style definitions
+        List of (style name, compiled pattern, replacement) tuples, see compile_styles()
     """
-    with open(styles_file, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return compile_styles(yaml_cache.load_yaml_cached(styles_file) or {})
 
 
-def apply_styles(content: str, styles_config: Dict[str, Any]) -> str:
+def compile_styles(styles_config: Dict[str, Any]) -> List[Tuple[str, re.Pattern, str]]:
     """
-    Apply custom styles to markdown content using regex patterns.
+    Compile the regex patterns of all styles once.
     
     Args:
-        content: Markdown content
         styles_config: Style configuration from YAML
     
     Returns:
-        Content with styles applied
+        List of (style name, compiled pattern, replacement) tuples, in definition order
     """
+    compiled = []
     styles = styles_config.get('styles', {})
     
     for style_name, style_def in styles.items():
@@ -55,72 +76,129 @@ def apply_styles(content: str, styles_config: Dict[str, Any]) -> str:
             
             if pattern and replacement:
                 try:
-                    # Apply the regex pattern
-                    content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-                    logger.debug(f"Applied style '{style_name}' with pattern: {pattern}")
+                    compiled.append((style_name, re.compile(pattern, re.MULTILINE), replacement))
                 except re.error as e:
                     logger.warning(f"Warning: Invalid regex pattern in style '{style_name}': {pattern} - {e}")
     
+    return compiled
+
+
+def fuse_styles(styles: List[Tuple[str, re.Pattern, str]]) -> Optional[re.Pattern]:
+    """
+    Fuse all style patterns into a single alternation (?P<s0>...)|(?P<s1>...)|...
+    
+    The styles are applied in order and a later pattern may match the output of an
+    earlier one, so the fused pattern cannot replace the per-pattern pass. It is used
+    to find out with a single scan whether any style applies to a piece of content.
+    
+    Args:
+        styles: Compiled styles from load_styles()
+    
+    Returns:
+        The fused pattern, or None if the patterns cannot be combined
+    """
+    if not styles or any(_BACKREF_RE.search(pattern.pattern) for _, pattern, _ in styles):
+        return None
+    
+    try:
+        return re.compile(
+            '|'.join(f'(?P<s{i}>{pattern.pattern})' for i, (_, pattern, _) in enumerate(styles)),
+            re.MULTILINE
+        )
+    except re.error as e:
+        logger.debug(f"Style patterns cannot be fused, applying them one by one: {e}")
+        return None
+
+
+def apply_styles(content: str, styles: List[Tuple[str, re.Pattern, str]],
+                 fused: Optional[re.Pattern] = None) -> str:
+    """
+    Apply custom styles to markdown content using regex patterns.
+    
+    Args:
+        content: Markdown content
+        styles: Compiled styles from load_styles()
+        fused: Optional fused pattern from fuse_styles()
+    
+    Returns:
+        Content with styles applied
+    """
+    # Single scan: nothing to do if no style matches at all
+    if fused is not None and not fused.search(content):
+        return content
+    
+    for style_name, pattern, replacement in styles:
+        content = pattern.sub(replacement, content)
+        # Arguments are only formatted if a sink accepts DEBUG records
+        logger.debug("Applied style '{}' with pattern: {}", style_name, pattern.pattern)
+    
     return content
 
 
-def process_file(input_file: Path, output_dir: Path, styles_config: Dict[str, Any]) -> Path:
+def _copy_unchanged(input_file: Path, output_file: Path) -> None:
+    """Copy a file that needs no styling to the output directory."""
+    if output_file.resolve() != input_file.resolve():
+        shutil.copyfile(input_file, output_file)
+
+
+def process_file(input_file: Path, output_dir: Path, styles: List[Tuple[str, re.Pattern, str]],
+                 fused: Optional[re.Pattern] = None) -> Path:
     """
     Process a single markdown file to apply custom styles.
     
     Args:
         input_file: Input markdown file
         output_dir: Output directory
-        styles_config: Style configuration
+        styles: Compiled styles from load_styles()
+        fused: Optional fused pattern from fuse_styles()
     
     Returns:
         Path to the output file
     """
-    with open(input_file, 'r', encoding='utf-8') as f:
+    # Write to output directory
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / input_file.name
+    
+    if not styles:
+        # Nothing to apply: plain copy without decoding (sendfile on Linux)
+        _copy_unchanged(input_file, output_file)
+        return output_file
+    
+    with open(input_file, 'r', encoding='utf-8', newline='') as f:
         content = f.read()
     
+    if '\r' in content:
+        # Same newline translation as a text-mode read
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    elif fused is not None and ':::' not in content and not fused.search(content):
+        # No style matches anywhere in the file. Only exact without fences: anchors and
+        # lookarounds can match at the edges of a segment between fences but nowhere
+        # in the whole file, so fenced files rely on the per-segment search instead.
+        _copy_unchanged(input_file, output_file)
+        return output_file
+    
     # Apply styles but avoid modifying fences of the form:
     # ::: {.... src="..." ...}
     # :::
-    # We scan the file line-by-line and skip replacements while inside a fenced block.
-    lines = content.splitlines(keepends=True)
-    out_lines = []
-    buffer = []
-    in_fenced = False
-
-    for line in lines:
-        stripped = line.strip()
-        # Detect start of include fence: line starts with ':::'
-        if not in_fenced and stripped.startswith(':::'):
-            # flush buffer (apply styles to accumulated non-fenced lines)
-            if buffer:
-                segment = ''.join(buffer)
-                out_lines.append(apply_styles(segment, styles_config))
-                buffer = []
-            in_fenced = True
-            out_lines.append(line)
-            continue
-
-        # Detect end of include fence
-        if in_fenced:
-            out_lines.append(line)
-            if stripped == ':::':
-                in_fenced = False
-            continue
-
-        # Normal content - accumulate for styled processing
-        buffer.append(line)
-
-    # flush any remaining buffer
-    if buffer:
-        segment = ''.join(buffer)
-        out_lines.append(apply_styles(segment, styles_config))
-
-    processed_content = ''.join(out_lines)
-    
-    # Write to output directory
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_file = output_dir / input_file.name
+    if not content:
+        # Empty segments are never styled: patterns that match the empty string add nothing
+        processed_content = content
+    elif ':::' not in content:
+        # No fences: style the whole content in one call
+        processed_content = apply_styles(content, styles, fused)
+    else:
+        # Locate the fenced blocks in a single scan and only style the text between them
+        chunks = []
+        position = 0
+        for match in _FENCE_RE.finditer(content):
+            start, end = match.span()
+            if start > position:
+                chunks.append(apply_styles(content[position:start], styles, fused))
+            chunks.append(content[start:end])
+            position = end
+        if position < len(content):
+            chunks.append(apply_styles(content[position:], styles, fused))
+        processed_content = ''.join(chunks)
     
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(processed_content)
@@ -155,14 +233,15 @@ def main(args: Optional[List[str]] = None) -> int:
             logger.error(f"Error: Styles file {styles_file} not found")
             return 1
         
-        styles_config = load_styles(styles_file)
+        styles = load_styles(styles_file)
+        fused = fuse_styles(styles)
         logger.info(f"Loaded styles from {styles_file}")
         
         # Set up output directory
         output_dir = Path(parsed_args.output) if parsed_args.output else Path.cwd()
         
         # Process files
-        processed_files = []
+        input_files = []
         for file_path in parsed_args.files:
             input_file = Path(file_path)
             if not input_file.exists():
@@ -170,8 +249,18 @@ def main(args: Optional[List[str]] = None) -> int:
                 continue
             
             print(f"Processing {input_file}")
-            output_file = process_file(input_file, output_dir, styles_config)
-            processed_files.append(output_file)
+            input_files.append(input_file)
+        
+        if len(input_files) > 1:
+            # Files are independent: spread them over worker processes
+            workers = min(len(input_files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                processed_files = list(executor.map(process_file, input_files, repeat(output_dir),
+                                                    repeat(styles), repeat(fused)))
+        else:
+            processed_files = [process_file(input_file, output_dir, styles, fused) for input_file in input_files]
+        
+        for output_file in processed_files:
             print(f"  -> {output_file}")
         
         print(f"Successfully processed {len(processed_files)} files")
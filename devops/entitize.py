@@ -13,10 +13,27 @@ import argparse
 import os
 import sys
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, List, Optional
 from loguru import logger
 
+# Pattern to match &entityname;
+_ENTITY_RE = re.compile(r'&([a-zA-Z][a-zA-Z0-9_]*);')
+
+# Pattern to match an entity reference cut short at the end of a block
+_PARTIAL_ENTITY_RE = re.compile(r'&(?:[a-zA-Z][a-zA-Z0-9_]*)?')
+
+# Size of the blocks read and written by process_file
+BLOCK_SIZE = 1 << 20
+
+# Files are concatenated with this separator by process_files_batched,
+# as long as their total size stays under the limit
+BATCH_SEPARATOR = '\x00\x00FILE_SEP\x00\x00\n'
+BATCH_SIZE_LIMIT = 128 << 20
+
 
 def load_entities(entities_file: Path) -> Dict[str, str]:
     """
@@ -48,29 +65,56 @@ def load_entities(entities_file: Path) -> Dict[str, str]:
     return entities
 
 
-def replace_entities(content: str, entities: Dict[str, str]) -> str:
+def warn_missing(missing: Counter, source: str = "content") -> None:
+    """
+    Log a single summary line for unknown entity references.
+    
+    Args:
+        missing: Counter of unknown entity names
+        source: Description of where the references were found
+    """
+    if missing:
+        top = ', '.join(f"&{name}; ({count})" for name, count in missing.most_common(10))
+        logger.warning(f"Warning: {sum(missing.values())} unknown entity references across "
+                       f"{len(missing)} names in {source}: {top}")
+
+
+def replace_entities(content: str, entities: Dict[str, str], missing: Optional[Counter] = None) -> str:
     """
     Replace entity references in content with Unicode characters.
     
     Args:
         content: Markdown content
         entities: Dictionary mapping entity names to Unicode characters
+        missing: Optional counter that collects unknown entity names instead of
+                 reporting them, so the caller can report them once
     
     Returns:
         Content with entities replaced
     """
-    def replace_entity(match):
-        entity_name = match.group(1)
-        if entity_name in entities:
-            return entities[entity_name]
-        else:
-            # Return the original if entity not found
-            logger.warning(f"Warning: Unknown entity &{entity_name};")
-            return match.group(0)
+    # Split into [text, name, text, name, ..., text] and look the names up in bulk,
+    # instead of calling back into Python for every match
+    parts = _ENTITY_RE.split(content)
+    if len(parts) == 1:
+        return content
+    
+    names = parts[1::2]
+    values = [entities.get(name) for name in names]
     
-    # Pattern to match &entityname;
-    pattern = r'&([a-zA-Z][a-zA-Z0-9_]*);'
-    return re.sub(pattern, replace_entity, content)
+    if None in values:
+        report = missing is None
+        if report:
+            missing = Counter()
+        for i, name in enumerate(names):
+            if values[i] is None:
+                # Keep the original if entity not found
+                missing[name] += 1
+                values[i] = f"&{name};"
+        if report:
+            warn_missing(missing)
+    
+    parts[1::2] = values
+    return ''.join(parts)
 
 
 def process_file(input_file: Path, output_dir: Path, entities: Dict[str, str]) -> Path:
@@ -85,22 +129,84 @@ def process_file(input_file: Path, output_dir: Path, entities: Dict[str, str]) -
     Returns:
         Path to the output file
     """
-    with open(input_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Replace entities
-    processed_content = replace_entities(content, entities)
-    
-    # Write to output directory
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / input_file.name
+    missing = Counter()
+    
+    if output_file.resolve() == input_file.resolve():
+        # Rewriting in place: the whole file has to be read before writing
+        content = input_file.read_text(encoding='utf-8')
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(replace_entities(content, entities, missing))
+        warn_missing(missing, str(input_file))
+        return output_file
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(processed_content)
+    # Stream the file block by block instead of holding input and output in memory
+    with open(input_file, 'r', encoding='utf-8', buffering=BLOCK_SIZE) as fin, \
+            open(output_file, 'w', encoding='utf-8', buffering=BLOCK_SIZE) as fout:
+        tail = ''
+        while True:
+            block = fin.read(BLOCK_SIZE)
+            if not block:
+                break
+            block = tail + block
+            # Hold back a trailing partial reference ('&', '&na'): it may end in the next block
+            cut = block.rfind('&')
+            if cut != -1 and _PARTIAL_ENTITY_RE.fullmatch(block, cut):
+                block, tail = block[:cut], block[cut:]
+            else:
+                tail = ''
+            fout.write(replace_entities(block, entities, missing))
+        fout.write(replace_entities(tail, entities, missing))
+    
+    warn_missing(missing, str(input_file))
     
     return output_file
 
 
+def process_files_batched(input_files: List[Path], output_dir: Path,
+                          entities: Dict[str, str]) -> Optional[List[Path]]:
+    """
+    Process several small markdown files with a single replacement pass over their
+    concatenation, then split the result back into the individual output files.
+    
+    Args:
+        input_files: Input markdown files
+        output_dir: Output directory
+        entities: Entity mappings
+    
+    Returns:
+        Paths to the output files, or None if the files must be processed one by one
+    """
+    if sum(input_file.stat().st_size for input_file in input_files) > BATCH_SIZE_LIMIT:
+        return None
+    
+    parts = []
+    for input_file in input_files:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+    
+    if any(BATCH_SEPARATOR in part for part in parts):
+        return None
+    
+    missing = Counter()
+    processed = replace_entities(BATCH_SEPARATOR.join(parts), entities, missing).split(BATCH_SEPARATOR)
+    if len(processed) != len(input_files):
+        # A replacement produced the separator: fall back to per-file processing
+        return None
+    warn_missing(missing, f"{len(input_files)} files")
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_files = []
+    for input_file, processed_content in zip(input_files, processed):
+        output_file = output_dir / input_file.name
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(processed_content)
+        output_files.append(output_file)
+    
+    return output_files
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """
     Main function that can be called from other scripts or command line.
@@ -135,7 +241,7 @@ def main(args: Optional[List[str]] = None) -> int:
         output_dir = Path(parsed_args.output) if parsed_args.output else Path.cwd()
         
         # Process files
-        processed_files = []
+        input_files = []
         for file_path in parsed_args.files:
             input_file = Path(file_path)
             if not input_file.exists():
@@ -143,8 +249,21 @@ def main(args: Optional[List[str]] = None) -> int:
                 continue
             
             logger.info(f"Processing {input_file}")
-            output_file = process_file(input_file, output_dir, entities)
-            processed_files.append(output_file)
+            input_files.append(input_file)
+        
+        if len(input_files) > 1:
+            # Small inputs: one replacement pass over all files at once
+            processed_files = process_files_batched(input_files, output_dir, entities)
+            if processed_files is None:
+                # Files are independent: spread them over worker processes
+                workers = min(len(input_files), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    processed_files = list(executor.map(process_file, input_files, repeat(output_dir),
+                                                        repeat(entities)))
+        else:
+            processed_files = [process_file(input_file, output_dir, entities) for input_file in input_files]
+        
+        for output_file in processed_files:
             logger.debug(f"  -> {output_file}")
         
         logger.success(f"Successfully processed {len(processed_files)} files")
@@ -7,39 +7,84 @@ Import this module at the beginning of your scripts to set up consistent logging
 """
 
 from loguru import logger
+import os
 import sys
 from pathlib import Path
 
 
-def setup_logging(level="INFO", log_file=None, format_string=None):
+def _resolve_level(level):
+    """
+    Normalize a log level given by name (any case) or number.
+    
+    Returns:
+        The level as an upper-case name or an int, or None if it is not a valid level
+    """
+    if isinstance(level, int):
+        return level
+    level = str(level).strip()
+    if level.isdigit():
+        return int(level)
+    level = level.upper()
+    try:
+        logger.level(level)
+    except ValueError:
+        return None
+    return level
+
+
+def setup_logging(level=None, log_file=None, format_string=None):
     """
     Configure loguru logging for the book creator project.
     
     Args:
-        level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        level: Log level name in any case (DEBUG, INFO, WARNING, ERROR, CRITICAL) or
+            number. Defaults to the LOGLEVEL environment variable, or INFO if it is not
+            set; unknown levels fall back to INFO with a warning
         log_file: Optional log file path
         format_string: Optional custom format string
     """
+    if level is None:
+        level = os.environ.get('LOGLEVEL', 'INFO')
+    unknown_level = None
+    resolved_level = _resolve_level(level)
+    if resolved_level is None:
+        unknown_level, resolved_level = level, 'INFO'
+    level = resolved_level
+    
     # Remove default handler
     logger.remove()
     
-    # Default format with colors for console
+    # Colors only help on a terminal; redirected output (CI, captured logs) gets plain text
+    colorize = sys.stderr.isatty()
+    
+    # Default console format
     if format_string is None:
-        format_string = (
-            "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-            "<level>{level: <8}</level> | "
-            "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-            "<level>{message}</level>"
-        )
+        if colorize:
+            format_string = (
+                "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+                "<level>{level: <8}</level> | "
+                "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+                "<level>{message}</level>"
+            )
+        else:
+            format_string = (
+                "{time:YYYY-MM-DD HH:mm:ss} | "
+                "{level: <8} | "
+                "{name}:{function}:{line} - "
+                "{message}"
+            )
     
-    # Add console handler with colors
+    # Add console handler
     logger.add(
         sys.stderr,
         format=format_string,
         level=level,
-        colorize=True
+        colorize=colorize
     )
     
+    if unknown_level is not None:
+        logger.warning(f"Warning: Unknown log level {unknown_level!r}, using INFO")
+    
     # Add file handler if specified
     if log_file:
         log_path = Path(log_file)
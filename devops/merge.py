@@ -13,54 +13,62 @@ import argparse
 import os
 import sys
 import re
-import yaml
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice, repeat
 from pathlib import Path
 from typing import Dict, List, Optional
 from loguru import logger
 
+try:
+    from . import yaml_cache
+except ImportError:
+    import yaml_cache
+
+# One pass over the content, matching at each line start either
+#  - a line starting with '#' (after optional whitespace): empty match, '#' is inserted, or
+#  - a title line followed by an underline made only of '=' or only of '-'; the underline
+#    is replaced by an empty line. '#' lines are never taken as titles, so a header is
+#    only demoted once.
+_HEADER_RE = re.compile(
+    r'^(?:(?=[^\S\n]*#)|(?![^\S\n]*#)([^\n]*)\n[^\S\n]*(=+|-+)[^\S\n]*$)',
+    re.MULTILINE
+)
+
+
+def _demote_header(match: re.Match) -> str:
+    """Return the replacement for one _HEADER_RE match."""
+    title = match.group(1)
+    if title is None:
+        return '#'
+    return ('## ' if match.group(2)[0] == '=' else '### ') + title + '\n'
+
 
 def demote_headers(content: str) -> str:
     """
     Demote all headers in markdown content by one level.
     Supports both # syntax and underline syntax.
     """
-    lines = content.split('\n')
-    result_lines = []
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Handle # syntax headers
-        if line.strip().startswith('#'):
-            # Add one more # to demote
-            result_lines.append('#' + line)
-        # Handle underline syntax (= and -)
-        elif i + 1 < len(lines):
-            next_line = lines[i + 1]
-            if next_line.strip() and all(c in '=' for c in next_line.strip()):
-                # H1 with === becomes ## H2
-                result_lines.append('## ' + line)
-                result_lines.append('')  # Add empty line instead of underline
-                i += 1  # Skip the underline
-            elif next_line.strip() and all(c in '-' for c in next_line.strip()):
-                # H2 with --- becomes ### H3
-                result_lines.append('### ' + line)
-                result_lines.append('')  # Add empty line instead of underline
-                i += 1  # Skip the underline
-            else:
-                result_lines.append(line)
-        else:
-            result_lines.append(line)
-        
-        i += 1
-    
-    return '\n'.join(result_lines)
+    return _HEADER_RE.sub(_demote_header, content)
+
+
+def read_demoted(md_file: Path) -> str:
+    """
+    Read a markdown file and demote its headers.
+    """
+    logger.debug(f"  - {md_file.name}")
+    content = md_file.read_bytes().decode('utf-8')
+    if '\r' in content:
+        # Same newline translation as reading in text mode
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return demote_headers(content)
 
 
-def merge_volume(volume_name: str, volume_config: Dict, input_dir: Path, output_dir: Path) -> None:
+def merge_volume(volume_name: str, volume_config: Dict, input_dir: Path, output_dir: Path,
+                 config_file: Optional[Path] = None) -> None:
     """
     Merge all markdown files for a single volume.
+    The merge is skipped when the output is newer than the inputs and config_file.
     """
     # Determine input path for this volume
     title = volume_config.get('title', volume_name)
@@ -71,35 +79,60 @@ def merge_volume(volume_name: str, volume_config: Dict, input_dir: Path, output_
         logger.warning(f"Warning: Input directory {volume_input_dir} does not exist, skipping {volume_name}")
         return
     
-    # Get all non temporary markdown files in alphabetical order
-    md_files = sorted([f for f in volume_input_dir.glob('*.md') if not f.name.endswith('.tmp.md')])
+    # Get all non temporary markdown files in alphabetical order. normcase gives the same
+    # order as sorting Path objects: case-sensitive on POSIX, case-insensitive on Windows.
+    with os.scandir(volume_input_dir) as entries:
+        md_files = sorted((entry.name for entry in entries
+                           if entry.name.endswith('.md') and not entry.name.endswith('.tmp.md')
+                           and entry.is_file()),
+                          key=os.path.normcase)
     
     if not md_files:
         logger.warning(f"Warning: No markdown files found in {volume_input_dir}")
         return
     
-    logger.info(f"Merging {len(md_files)} files for {volume_name}:")
+    output_file = output_dir / f"{volume_name}.md"
     
-    merged_content = []
-    merged_content.append(f"# {title}\n")
-    for md_file in md_files:
-        logger.debug(f"  - {md_file.name}")
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Demote headers and add to merged content
-        demoted_content = demote_headers(content)
-        merged_content.append(demoted_content)
+    # Nothing to do if the merged file is newer than every input. The volume directory
+    # is included so that added, removed or renamed files also trigger a merge.
+    try:
+        inputs = [volume_input_dir] + [volume_input_dir / name for name in md_files]
+        if config_file is not None:
+            inputs.append(config_file)
+        newest = max(os.stat(p).st_mtime_ns for p in inputs)
+        if os.stat(output_file).st_mtime_ns >= newest:
+            logger.info(f"Merged file is up to date: {output_file}")
+            return
+    except OSError:
+        pass
     
-    # Combine all content
-    final_content = '\n\n'.join(merged_content)
+    logger.info(f"Merging {len(md_files)} files for {volume_name}:")
     
-    # Write merged file
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_file = output_dir / f"{volume_name}.md"
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(final_content)
+    # Write to a temporary file and only replace the output once the merge is complete:
+    # a partial output would be newer than its inputs and skipped as up to date next time
+    tmp_file = output_file.with_name(f"{output_file.name}.{os.getpid()}.tmp")
+    try:
+        # Files are read and demoted concurrently and written in order. At most `workers`
+        # files are in flight, so memory stays bounded by a few files, not the whole volume.
+        workers = min(8, len(md_files))
+        md_paths = (volume_input_dir / name for name in md_files)
+        with open(tmp_file, 'w', encoding='utf-8') as out, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(executor.submit(read_demoted, path) for path in islice(md_paths, workers))
+            out.write(f"# {title}\n")
+            while pending:
+                demoted_content = pending.popleft().result()
+                next_path = next(md_paths, None)
+                if next_path is not None:
+                    pending.append(executor.submit(read_demoted, next_path))
+                out.write('\n\n')
+                out.write(demoted_content)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
     
     logger.success(f"Created merged file: {output_file}")
 
@@ -132,8 +165,7 @@ def main(args: Optional[List[str]] = None) -> int:
             logger.error(f"Error: Configuration file {config_path} not found")
             return 1
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = yaml_cache.load_yaml_cached(config_path)
         
         # Set up directories
         input_dir = Path(parsed_args.input) if parsed_args.input else Path.cwd()
@@ -151,11 +183,17 @@ def main(args: Optional[List[str]] = None) -> int:
             if parsed_args.volume not in volumes:
                 logger.error(f"Error: Volume {parsed_args.volume} not found in configuration")
                 return 1
-            merge_volume(parsed_args.volume, volumes[parsed_args.volume], input_dir, output_dir)
+            merge_volume(parsed_args.volume, volumes[parsed_args.volume], input_dir, output_dir, config_path)
         else:
-            # Process all volumes
-            for volume_name, volume_config in volumes.items():
-                merge_volume(volume_name, volume_config, input_dir, output_dir)
+            # Process all volumes: they are independent, so spread them over worker processes
+            if len(volumes) > 1:
+                workers = min(len(volumes), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(merge_volume, volumes.keys(), volumes.values(),
+                                      repeat(input_dir), repeat(output_dir), repeat(config_path)))
+            else:
+                for volume_name, volume_config in volumes.items():
+                    merge_volume(volume_name, volume_config, input_dir, output_dir, config_path)
         
         return 0
         
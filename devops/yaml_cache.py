@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+YAML Configuration Cache for Book Creator
+
+This module loads YAML configuration files (volumes.yaml, styles.yaml) through a
+pickle sidecar cache stored next to the YAML file as <file>.cache.
+The cache is reused as long as the modification time and size of the YAML file are
+unchanged, so chained calls (merge -> entitize -> customize -> build) parse each
+file only once.
+"""
+
+import os
+import pickle
+import struct
+import yaml
+from pathlib import Path
+from typing import Any
+from loguru import logger
+
+# Use the libyaml-based loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Cache header: format tag, then st_mtime_ns and st_size of the YAML file (24 bytes)
+_MAGIC = b'BCYAML01'
+_HEADER = struct.Struct('<8sqq')
+
+
+def _cache_path(path: Path) -> Path:
+    """Return the sidecar cache path for a YAML file."""
+    return path.with_name(path.name + '.cache')
+
+
+def load_yaml_cached(path: Path) -> Any:
+    """
+    Load a YAML file, reusing the pickle sidecar cache when it is up to date.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        The parsed YAML data
+    """
+    path = Path(path)
+    cache_file = _cache_path(path)
+    st = path.stat()
+    header = _HEADER.pack(_MAGIC, st.st_mtime_ns, st.st_size)
+
+    try:
+        cache_bytes = cache_file.read_bytes()
+        if cache_bytes[:_HEADER.size] == header:
+            return pickle.loads(cache_bytes[_HEADER.size:])
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        # Missing or unreadable cache: fall back to parsing the YAML
+        pass
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_SafeLoader)
+
+    try:
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(header)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except (OSError, pickle.PicklingError) as e:
+        logger.debug(f"Could not write YAML cache {cache_file}: {e}")
+
+    return data
@@ -15,8 +15,11 @@ Usage:
 """
 
 import unittest
+import contextlib
+import io
 import sys
 import os
+import re
 import tempfile
 import shutil
 import subprocess
@@ -49,6 +52,52 @@ except ImportError as e:
     MODULES_AVAILABLE = False
 
 
+# Markers of included content in an ODT's content.xml
+_INCLUDE_RE = re.compile(rb'INCLUDE:|INCLUDE_PLACEHOLDER|hatched_rect')
+
+
+def _fast_rmtree(path):
+    """Remove a directory tree, ignoring errors like shutil.rmtree(ignore_errors=True).
+
+    Uses the file type reported by os.scandir instead of a stat call per entry.
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        _fast_rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+def _list_dir(directory):
+    """Return the entry names of directory from one os.scandir pass (empty if it is missing)."""
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries]
+    except FileNotFoundError:
+        return []
+
+
+def _link_or_copy(src, dst):
+    """Hard-link src to dst, copying instead where linking is not possible."""
+    # dst usually exists from an earlier test run; os.link will not overwrite it
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
 class TestArtDecoBookCreator(unittest.TestCase):
     """Test suite for the Art Deco Book Creator project."""
     
@@ -66,6 +115,17 @@ class TestArtDecoBookCreator(unittest.TestCase):
         cls.styles_config = cls.artdeco_dir / 'styles.yaml'
         cls.entities_file = cls.artdeco_dir / 'basic.nam'
         
+        # Config file arguments injected into build-books runs (only those that exist)
+        cls._cfg_args = [str(p) for p in (cls.volumes_config, cls.styles_config, cls.entities_file)
+                         if p.exists()]
+        
+        # Ensure build-books subprocesses can import the devops package by adding
+        # the project root to PYTHONPATH while running from the fixture cwd.
+        env = os.environ.copy()
+        existing = env.get('PYTHONPATH', '')
+        env['PYTHONPATH'] = str(cls.project_root) + (os.pathsep + existing if existing else '')
+        cls._child_env = env
+        
         # Ensure test output directory exists
         cls.test_output_dir.mkdir(exist_ok=True)
 
@@ -74,10 +134,12 @@ class TestArtDecoBookCreator(unittest.TestCase):
         # Remove any existing sinks to avoid duplicate logs when reloading tests
         logger.remove()
         log_path = cls.test_output_dir / 'tests.log'
+        # INFO by default; set LOGURU_LEVEL=DEBUG for verbose test logs
+        cls._log_level = os.environ.get('LOGURU_LEVEL', 'INFO')
         logger.add(
             str(log_path),
-            level="DEBUG",
-            enqueue=True,
+            level=cls._log_level,
+            enqueue=False,
             encoding="utf-8",
             rotation="10 MB"
         )
@@ -108,7 +170,7 @@ class TestArtDecoBookCreator(unittest.TestCase):
         
         for directory in directories_to_clean:
             if directory.exists():
-                shutil.rmtree(directory, ignore_errors=True)
+                _fast_rmtree(directory)
     
     def _run_python_module(self, module_name, args):
         """Helper method to run a Python module as subprocess."""
@@ -128,6 +190,26 @@ class TestArtDecoBookCreator(unittest.TestCase):
         except Exception as e:
             return 1, "", str(e)
     
+    def _run_build_books_in_process(self, args, cwd):
+        """Helper method to run build_books.main() in this process from cwd.
+
+        Only used for builds that do not start worker processes (a single -vol).
+
+        Returns the exit code and the captured stdout and stderr, with log
+        records written to stderr as they would be by a child process.
+        """
+        buf_out, buf_err = io.StringIO(), io.StringIO()
+        sink_id = logger.add(buf_err, level=self._log_level)
+        try:
+            with contextlib.chdir(cwd), contextlib.redirect_stdout(buf_out), \
+                    contextlib.redirect_stderr(buf_err):
+                returncode = build_books.main(args)
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else 1
+        finally:
+            logger.remove(sink_id)
+        return returncode, buf_out.getvalue(), buf_err.getvalue()
+    
     def _run_build_books(self, args):
         """Helper method to run build-books as a module via -m.
 
@@ -135,23 +217,13 @@ class TestArtDecoBookCreator(unittest.TestCase):
         tests/artdeco when not asking for help and when those files exist.
         """
         # Skip adding config files when caller requests help
-        if any(a in ('-h', '--help') or (isinstance(a, str) and a.startswith('-h')) for a in args):
+        help_requested = any(a in ('-h', '--help') or (isinstance(a, str) and a.startswith('-h')) for a in args)
+        if help_requested:
+            cfg_args = []
             cmd = [sys.executable, '-m', 'devops.build_books'] + args
         else:
-            # Build path to config files from the test artdeco directory
-            artdeco = self.project_root / 'tests' / 'artdeco'
-            vols = artdeco / 'volumes.yaml'
-            styles = artdeco / 'styles.yaml'
-            entities = artdeco / 'basic.nam'
-
-            # Only add existing config files and avoid duplication
-            cfg_args = []
-            if vols.exists() and str(vols) not in args:
-                cfg_args.append(str(vols))
-            if styles.exists() and str(styles) not in args:
-                cfg_args.append(str(styles))
-            if entities.exists() and str(entities) not in args:
-                cfg_args.append(str(entities))
+            # Config files found in setUpClass, without duplicating any the caller passed
+            cfg_args = [a for a in self._cfg_args if a not in args]
 
             cmd = [sys.executable, '-m', 'devops.build_books'] + cfg_args + args
 
@@ -159,20 +231,23 @@ class TestArtDecoBookCreator(unittest.TestCase):
         # merge will read the test content (tests/artdeco/content/*).
         artdeco_cwd = self.project_root / 'tests' / 'artdeco'
         try:
-            # Ensure the subprocess can import the devops package by adding
-            # the project root to PYTHONPATH while running from the fixture cwd.
-            env = os.environ.copy()
-            existing = env.get('PYTHONPATH', '')
-            env['PYTHONPATH'] = str(self.project_root) + (os.pathsep + existing if existing else '')
-
-            result = subprocess.run(
-                cmd,
-                cwd=str(artdeco_cwd),
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=180  # 3 minute timeout for full builds
-            )
+            if MODULES_AVAILABLE and not help_requested and '-vol' in args:
+                # Single-volume builds run entirely in one process, so main() can be called
+                # directly instead of starting a new interpreter. Multi-volume builds use a
+                # process pool whose workers would print into their own copy of the redirected
+                # stdout (and would fork the test runner), so they still run as a subprocess,
+                # as does --help because argparse exits after printing it.
+                returncode, stdout, stderr = self._run_build_books_in_process(cfg_args + args, artdeco_cwd)
+            else:
+                result = subprocess.run(
+                    cmd,
+                    cwd=str(artdeco_cwd),
+                    env=self._child_env,
+                    capture_output=True,
+                    text=True,
+                    timeout=180  # 3 minute timeout for full builds
+                )
+                returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
             # Persist child stdout/stderr and the exact command to files inside the
             # test output directory so we can inspect pandoc invocation and loguru output
             try:
@@ -180,19 +255,19 @@ class TestArtDecoBookCreator(unittest.TestCase):
                 log_dir.mkdir(parents=True, exist_ok=True)
 
                 # Append full child info to main tests.log for convenience
+                cmd_line = ' '.join(map(str, cmd))
                 with open(log_dir / 'tests.log', 'a', encoding='utf-8') as lof:
-                    lof.write('\n===== CHILD PROCESS CMD =====\n')
-                    lof.write(' '.join(map(str, cmd)) + '\n')
-                    lof.write('----- STDOUT -----\n')
-                    lof.write(result.stdout or '')
-                    lof.write('\n----- STDERR -----\n')
-                    lof.write(result.stderr or '')
-                    lof.write('\n===== END CHILD PROCESS =====\n')
+                    lof.write(
+                        f"\n===== CHILD PROCESS CMD =====\n{cmd_line}\n"
+                        f"----- STDOUT -----\n{stdout or ''}\n"
+                        f"----- STDERR -----\n{stderr or ''}\n"
+                        f"===== END CHILD PROCESS =====\n"
+                    )
 
                 # Separate files for programmatic inspection
-                (log_dir / 'child_stdout.log').write_text(result.stdout or '', encoding='utf-8')
-                (log_dir / 'child_stderr.log').write_text(result.stderr or '', encoding='utf-8')
-                (log_dir / 'child_cmd.txt').write_text(' '.join(map(str, cmd)), encoding='utf-8')
+                (log_dir / 'child_stdout.log').write_text(stdout or '', encoding='utf-8')
+                (log_dir / 'child_stderr.log').write_text(stderr or '', encoding='utf-8')
+                (log_dir / 'child_cmd.txt').write_text(cmd_line, encoding='utf-8')
 
                 # Persist any input markdowns that were created under the fixture obj/custom
                 try:
@@ -201,7 +276,7 @@ class TestArtDecoBookCreator(unittest.TestCase):
                     if src_obj_custom.exists():
                         saved_inputs.mkdir(parents=True, exist_ok=True)
                         for md in src_obj_custom.glob('*.md'):
-                            shutil.copy(md, saved_inputs / md.name)
+                            _link_or_copy(md, saved_inputs / md.name)
                 except Exception:
                     # don't fail on this secondary logging step
                     pass
@@ -221,24 +296,26 @@ class TestArtDecoBookCreator(unittest.TestCase):
                     if out_dir is None:
                         out_dir = log_dir
 
-                    for odt in Path(out_dir).glob('*.odt'):
+                    for odt in (Path(out_dir) / name for name in _list_dir(out_dir) if name.endswith('.odt')):
                         target_dir = odt_extract_dir / odt.stem
                         target_dir.mkdir(parents=True, exist_ok=True)
                         try:
                             with ZipFile(odt, 'r') as z:
-                                if 'content.xml' in z.namelist():
-                                    with z.open('content.xml') as cf:
-                                        content_xml = cf.read().decode('utf-8')
-                                        (target_dir / 'content.xml').write_text(content_xml, encoding='utf-8')
-                                        # Quick check for include placeholders
-                                        report_lines = []
-                                        if 'INCLUDE:' in content_xml or 'INCLUDE_PLACEHOLDER' in content_xml or 'hatched_rect' in content_xml:
-                                            report_lines.append(f"Include-like content found in {odt.name}")
-                                        else:
-                                            report_lines.append(f"No include content found in {odt.name}")
-                                        # append to include_report.txt
-                                        with open(log_dir / 'include_report.txt', 'a', encoding='utf-8') as ir:
-                                            ir.write('\n'.join(report_lines) + '\n')
+                                try:
+                                    # Kept as bytes: written out and searched without decoding
+                                    content_xml = z.read('content.xml')
+                                except KeyError:
+                                    continue
+                            (target_dir / 'content.xml').write_bytes(content_xml)
+                            # Quick check for include placeholders
+                            report_lines = []
+                            if _INCLUDE_RE.search(content_xml):
+                                report_lines.append(f"Include-like content found in {odt.name}")
+                            else:
+                                report_lines.append(f"No include content found in {odt.name}")
+                            # append to include_report.txt
+                            with open(log_dir / 'include_report.txt', 'a', encoding='utf-8') as ir:
+                                ir.write('\n'.join(report_lines) + '\n')
                         except Exception:
                             continue
                 except Exception:
@@ -248,7 +325,7 @@ class TestArtDecoBookCreator(unittest.TestCase):
                 # Best-effort: don't let logging failures break the test helper
                 pass
 
-            return result.returncode, result.stdout, result.stderr
+            return returncode, stdout, stderr
         except subprocess.TimeoutExpired:
             return 1, "", "Process timed out"
         except Exception as e:
@@ -276,15 +353,15 @@ class TestArtDecoBookCreator(unittest.TestCase):
             print(f"   stderr: {stderr[-500:]}")  # Last 1000 chars
 
         # Require that build produced at least one PDF in the final output dir
-        pdfs = list(test_build_dir.glob('*.pdf')) if test_build_dir.exists() else []
+        output_names = _list_dir(test_build_dir)
+        pdfs = [name for name in output_names if name.endswith('.pdf')]
         self.assertGreater(
             len(pdfs), 0,
             f"Expected at least one PDF in {test_build_dir}. stdout:\n{stdout}\nstderr:\n{stderr}"
         )
         
         if test_build_dir.exists():
-            output_files = list(test_build_dir.glob('*'))
-            print(f"   Build output files: {[f.name for f in output_files]}")
+            print(f"   Build output files: {output_names}")
         
         print("✅ Build-books process completed")
     
@@ -308,7 +385,8 @@ class TestArtDecoBookCreator(unittest.TestCase):
             print(f"   stderr: {stderr[-500:]}")  # Last 500 chars
         
         # Require that build produced at least one PDF in the final output dir
-        pdfs = list(test_build_dir.glob('*.pdf')) if test_build_dir.exists() else []
+        output_names = _list_dir(test_build_dir)
+        pdfs = [name for name in output_names if name.endswith('.pdf')]
         self.assertGreater(
             len(pdfs), 0,
             f"Expected at least one PDF in {test_build_dir}. stdout:\n{stdout}\nstderr:\n{stderr}"
@@ -325,8 +403,7 @@ class TestArtDecoBookCreator(unittest.TestCase):
             print(f"   Custom file exists: {custom_file.exists()}")
 
         if test_build_dir.exists():
-            output_files = list(test_build_dir.glob('*'))
-            print(f"   Final output files: {[f.name for f in output_files]}")
+            print(f"   Final output files: {output_names}")
         
         print("✅ Build-books for volume-001 completed")
     
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the multi-volume pipeline in devops/build.py.
+
+Pandoc and LibreOffice are replaced by stubs of build_volume_odt/build_volume_pdf,
+so these tests only check how build.main drives the shared LibreOffice server.
+
+Usage:
+    python -m unittest tests.test_build
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from loguru import logger
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from devops import build
+
+
+class TestBuildMain(unittest.TestCase):
+    """LibreOffice server handling in build.main when building all volumes."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+        self.messages = []
+        self._sink_id = logger.add(self.messages.append, level='WARNING', format='{message}')
+
+    def tearDown(self):
+        logger.remove(self._sink_id)
+        self._tmp.cleanup()
+
+    def _main(self, volumes, start_server):
+        config_file = self.tmp_dir / 'volumes.yaml'
+        config_file.write_text('volumes:\n' + ''.join(f'  {name}: {{title: {name}}}\n' for name in volumes),
+                               encoding='utf-8')
+        with patch.object(build, 'start_libreoffice_server', side_effect=start_server) as start, \
+                patch.object(build, 'stop_libreoffice_server') as stop, \
+                patch.object(build, 'build_volume_odt',
+                             side_effect=lambda name, config, input_dir, output_dir: output_dir / f"{name}.odt"), \
+                patch.object(build, 'build_volume_pdf', return_value=True) as build_pdf:
+            rc = build.main([str(config_file), '--output', str(self.tmp_dir / 'build')])
+        return rc, start, stop, build_pdf
+
+    def test_server_is_shared_by_all_volumes(self):
+        rc, start, stop, build_pdf = self._main(['v1', 'v2'], lambda: True)
+        self.assertEqual(rc, 0)
+        start.assert_called_once_with()
+        stop.assert_called_once_with()
+        self.assertEqual(build_pdf.call_count, 2)
+        self.assertEqual(self.messages, [])
+
+    def test_single_volume_skips_server(self):
+        rc, start, stop, build_pdf = self._main(['v1'], lambda: True)
+        self.assertEqual(rc, 0)
+        start.assert_not_called()
+        self.assertEqual(build_pdf.call_count, 1)
+
+    def test_server_start_failure_is_reported(self):
+        rc, start, stop, build_pdf = self._main(['v1', 'v2'], PermissionError('soffice: permission denied'))
+        self.assertEqual(rc, 0)
+        self.assertEqual(build_pdf.call_count, 2)
+        stop.assert_called_once_with()
+        self.assertEqual(len(self.messages), 1)
+        self.assertIn('soffice: permission denied', self.messages[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the text transforms of the Book Creator pipeline.
+
+These tests run the transform functions directly on small temporary inputs, so
+unlike tests/test_artdeco.py they need neither Pandoc nor LibreOffice.
+
+Usage:
+    python -m unittest tests.test_transforms
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from devops import merge
+from devops import entitize
+from devops import customize
+from devops import yaml_cache
+
+
+class TransformTestCase(unittest.TestCase):
+    """Base class providing a temporary working directory."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+
+class TestDemoteHeaders(unittest.TestCase):
+    """Header demotion in merge.demote_headers."""
+
+    def test_hash_headers(self):
+        self.assertEqual(merge.demote_headers("# A\ntext\n  ## B\n"), "## A\ntext\n#  ## B\n")
+
+    def test_underlined_headers(self):
+        self.assertEqual(merge.demote_headers("Title\n=====\n\nSub\n  ---  \nbody"),
+                         "## Title\n\n\n### Sub\n\nbody")
+
+    def test_headers_are_demoted_once(self):
+        # A '#' line is never the title of an underline
+        self.assertEqual(merge.demote_headers("# A\n===\n===\n"), "## A\n## ===\n\n")
+
+    def test_underline_consumed_once(self):
+        self.assertEqual(merge.demote_headers("a\n---\n---"), "### a\n\n---")
+
+    def test_mixed_underline_is_text(self):
+        self.assertEqual(merge.demote_headers("a\n-=-\n"), "a\n-=-\n")
+
+
+class TestMergeVolume(TransformTestCase):
+    """Incremental and failure behaviour of merge.merge_volume."""
+
+    def setUp(self):
+        super().setUp()
+        self.volume_dir = self.tmp_dir / 'vol'
+        self.volume_dir.mkdir()
+        self.output_dir = self.tmp_dir / 'obj'
+        self.output_file = self.output_dir / 'vol.md'
+        (self.volume_dir / 'a.md').write_text("Title\n=====\n\nfirst\n", encoding='utf-8')
+
+    def _merge(self):
+        merge.merge_volume('vol', {'title': 'T'}, self.tmp_dir, self.output_dir)
+
+    def _bump_mtime(self, path, seconds=10):
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 10**9))
+
+    def test_merge_order_and_content(self):
+        (self.volume_dir / 'b.md').write_text("# Second\n", encoding='utf-8')
+        (self.volume_dir / 'skip.tmp.md').write_text("# Temporary\n", encoding='utf-8')
+        self._merge()
+        self.assertEqual(self.output_file.read_text(encoding='utf-8'),
+                         "# T\n\n\n## Title\n\n\nfirst\n\n\n## Second\n")
+
+    def test_up_to_date_output_is_skipped(self):
+        self._merge()
+        self._bump_mtime(self.output_file)
+        mtime = self.output_file.stat().st_mtime_ns
+        self._merge()
+        self.assertEqual(self.output_file.stat().st_mtime_ns, mtime)
+
+    def test_changed_input_is_merged_again(self):
+        self._merge()
+        input_file = self.volume_dir / 'a.md'
+        input_file.write_text("changed\n", encoding='utf-8')
+        self._bump_mtime(input_file, 20)
+        self._merge()
+        self.assertEqual(self.output_file.read_text(encoding='utf-8'), "# T\n\n\nchanged\n")
+
+    def test_failed_merge_leaves_no_output(self):
+        (self.volume_dir / 'b.md').write_bytes(b'x\xff\n')
+        with self.assertRaises(UnicodeDecodeError):
+            self._merge()
+        self.assertFalse(self.output_file.exists())
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+        # The next run must merge again instead of reporting a truncated file as up to date
+        (self.volume_dir / 'b.md').write_text("second\n", encoding='utf-8')
+        self._merge()
+        self.assertTrue(self.output_file.read_text(encoding='utf-8').endswith("second\n"))
+
+
+class TestEntitize(TransformTestCase):
+    """Entity replacement in entitize."""
+
+    ENTITIES = {'amp': '&', 'alpha': 'α', 'long_name1': 'L'}
+    CONTENT = "a &amp; b &alpha;x &unknown; &long_name1;&amp&&alpha;\n&amp;"
+    EXPECTED = "a & b αx &unknown; L&amp&α\n&"
+
+    def _write_inputs(self, texts):
+        input_files = []
+        for i, text in enumerate(texts):
+            input_file = self.tmp_dir / f"in{i}.md"
+            input_file.write_text(text, encoding='utf-8')
+            input_files.append(input_file)
+        return input_files
+
+    def test_replace_entities(self):
+        self.assertEqual(entitize.replace_entities(self.CONTENT, self.ENTITIES), self.EXPECTED)
+
+    def test_references_split_across_blocks(self):
+        input_file = self.tmp_dir / 'in.md'
+        input_file.write_text(self.CONTENT, encoding='utf-8')
+        for block_size in range(2, len(self.CONTENT) + 2):
+            with self.subTest(block_size=block_size), patch.object(entitize, 'BLOCK_SIZE', block_size):
+                output_file = entitize.process_file(input_file, self.tmp_dir / 'out', self.ENTITIES)
+                self.assertEqual(output_file.read_text(encoding='utf-8'), self.EXPECTED)
+
+    def test_batched_matches_per_file(self):
+        input_files = self._write_inputs([self.CONTENT, "&alpha;", "", "&amp"])
+        batched = entitize.process_files_batched(input_files, self.tmp_dir / 'batched', self.ENTITIES)
+        self.assertIsNotNone(batched)
+        for input_file, output_file in zip(input_files, batched):
+            expected = entitize.replace_entities(input_file.read_text(encoding='utf-8'), self.ENTITIES)
+            self.assertEqual(output_file.read_text(encoding='utf-8'), expected)
+
+    def test_batched_falls_back_above_size_limit(self):
+        input_files = self._write_inputs([self.CONTENT, self.CONTENT])
+        with patch.object(entitize, 'BATCH_SIZE_LIMIT', len(self.CONTENT)):
+            self.assertIsNone(entitize.process_files_batched(input_files, self.tmp_dir / 'out', self.ENTITIES))
+
+    def test_batched_falls_back_on_separator_in_input(self):
+        input_files = self._write_inputs([self.CONTENT, "a" + entitize.BATCH_SEPARATOR + "b"])
+        self.assertIsNone(entitize.process_files_batched(input_files, self.tmp_dir / 'out', self.ENTITIES))
+
+    def test_batched_falls_back_on_separator_in_replacement(self):
+        input_files = self._write_inputs(["&sep;", "&amp;"])
+        entities = dict(self.ENTITIES, sep=entitize.BATCH_SEPARATOR)
+        self.assertIsNone(entitize.process_files_batched(input_files, self.tmp_dir / 'out', entities))
+        self.assertFalse((self.tmp_dir / 'out').exists())
+
+
+class TestCustomize(TransformTestCase):
+    """Style application and fence handling in customize.process_file."""
+
+    STYLES_CONFIG = {
+        'styles': {
+            'Upper': {'patterns': [{'pattern': 'x', 'replacement': 'X'}]},
+        }
+    }
+
+    def _process(self, text, styles_config=None):
+        input_file = self.tmp_dir / 'in.md'
+        input_file.write_bytes(text.encode('utf-8'))
+        styles = customize.compile_styles(self.STYLES_CONFIG if styles_config is None else styles_config)
+        output_file = customize.process_file(input_file, self.tmp_dir / 'out', styles,
+                                             customize.fuse_styles(styles))
+        return output_file.read_bytes().decode('utf-8')
+
+    def _styles_config(self, pattern, replacement):
+        return {'styles': {'Test': {'patterns': [{'pattern': pattern, 'replacement': replacement}]}}}
+
+    def test_text_outside_fences_is_styled(self):
+        self.assertEqual(self._process("x\n::: {.inc src=\"x\"}\nx\n:::\nx\n"),
+                         "X\n::: {.inc src=\"x\"}\nx\n:::\nX\n")
+
+    def test_unclosed_fence_runs_to_end(self):
+        self.assertEqual(self._process("x\n  ::: {.a}\nx\nx"), "X\n  ::: {.a}\nx\nx")
+
+    def test_fence_lines_end_at_any_line_separator(self):
+        # Same line splitting as str.splitlines(): \v and \u2028 end lines too
+        self.assertEqual(self._process(" ::x\v:::\vxx"), " ::X\v:::\vxx")
+        self.assertEqual(self._process("x\u2028:::\u2028x\u2028:::\u2028x"), "X\u2028:::\u2028x\u2028:::\u2028X")
+
+    def test_empty_segments_are_not_styled(self):
+        # A pattern matching the empty string must not add text after a closing fence
+        # or to an empty file
+        styles_config = self._styles_config('^$', 'E')
+        self.assertEqual(self._process("x\n::: {.a}\n:::\ny\n:::\n", styles_config), "x\nE::: {.a}\n:::\ny\nE:::\n")
+        self.assertEqual(self._process("x\n:::\n:::\n", styles_config), "x\nE:::\n:::\n")
+        self.assertEqual(self._process("", styles_config), "")
+
+    def test_crlf_is_normalized(self):
+        self.assertEqual(self._process("x\r\n:::\r\nx\r\n:::\r\n"), "X\n:::\nx\n:::\n")
+
+    def test_invalid_pattern_is_skipped(self):
+        config = {'styles': {'Bad': {'patterns': [{'pattern': '(', 'replacement': 'y'}]},
+                             'Upper': self.STYLES_CONFIG['styles']['Upper']}}
+        self.assertEqual([name for name, _, _ in customize.compile_styles(config)], ['Upper'])
+
+    def test_unfusable_patterns(self):
+        config = {'styles': {'Upper': self.STYLES_CONFIG['styles']['Upper'],
+                             'Double': {'patterns': [{'pattern': r'(y)\1', 'replacement': 'Y'}]}}}
+        self.assertIsNone(customize.fuse_styles(customize.compile_styles(config)))
+        self.assertIsNone(customize.fuse_styles([]))
+
+    def test_fused_search_keeps_chained_styles(self):
+        # The second style only matches the output of the first one
+        config = {'styles': {'Upper': self.STYLES_CONFIG['styles']['Upper'],
+                             'Chain': {'patterns': [{'pattern': 'X', 'replacement': 'Y'}]}}}
+        styles = customize.compile_styles(config)
+        fused = customize.fuse_styles(styles)
+        self.assertIsNotNone(fused)
+        self.assertEqual(customize.apply_styles("x\nab\n", styles, fused), "Y\nab\n")
+        self.assertEqual(customize.apply_styles("ab\n", styles, fused), "ab\n")
+        self.assertEqual(self._process("x\n:::\nx\n:::\n", config), "Y\n:::\nx\n:::\n")
+
+    def test_unstyled_file_is_copied(self):
+        with patch.object(customize, '_copy_unchanged', wraps=customize._copy_unchanged) as copy:
+            self.assertEqual(self._process("no match\n"), "no match\n")
+            self.assertEqual(self._process("a\n", {}), "a\n")
+        self.assertEqual(copy.call_count, 2)
+
+    def test_unstyled_crlf_file_is_rewritten(self):
+        self.assertEqual(self._process("a\r\nb\rc"), "a\nb\nc")
+
+    def test_anchored_pattern_in_segment(self):
+        # \A and ^ match at the start of each segment between fences, even where they
+        # match nowhere in the whole file
+        self.assertEqual(self._process("x\n::: {.a}\n:::\ny\n", self._styles_config(r'\Ay', 'Y')),
+                         "x\n::: {.a}\n:::\nY\n")
+        self.assertEqual(self._process("\v ::::::=\t-=\u2028\t:::\va", self._styles_config('^a', 'A')),
+                         "\v ::::::=\t-=\u2028\t:::\vA")
+        with patch.object(customize, '_copy_unchanged') as copy:
+            self._process("x\n::: {.a}\n:::\nz\n", self._styles_config(r'\Ay', 'Y'))
+        copy.assert_not_called()
+
+
+class TestYamlCache(TransformTestCase):
+    """Sidecar cache invalidation in yaml_cache.load_yaml_cached."""
+
+    def setUp(self):
+        super().setUp()
+        self.yaml_file = self.tmp_dir / 'volumes.yaml'
+        self.yaml_file.write_text("volumes:\n  a: {title: A}\n", encoding='utf-8')
+
+    def test_cache_hit_skips_parsing(self):
+        data = yaml_cache.load_yaml_cached(self.yaml_file)
+        self.assertTrue((self.tmp_dir / 'volumes.yaml.cache').exists())
+        with patch.object(yaml_cache.yaml, 'load', side_effect=AssertionError("YAML parsed again")):
+            self.assertEqual(yaml_cache.load_yaml_cached(self.yaml_file), data)
+
+    def test_changed_file_is_parsed_again(self):
+        yaml_cache.load_yaml_cached(self.yaml_file)
+        # Same size, different content: only the modification time tells them apart
+        st = self.yaml_file.stat()
+        self.yaml_file.write_text("volumes:\n  b: {title: B}\n", encoding='utf-8')
+        os.utime(self.yaml_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(yaml_cache.load_yaml_cached(self.yaml_file), {'volumes': {'b': {'title': 'B'}}})
+
+    def test_corrupt_cache_is_ignored(self):
+        yaml_cache.load_yaml_cached(self.yaml_file)
+        cache_file = self.tmp_dir / 'volumes.yaml.cache'
+        cache_file.write_bytes(cache_file.read_bytes()[:30])
+        self.assertEqual(yaml_cache.load_yaml_cached(self.yaml_file), {'volumes': {'a': {'title': 'A'}}})
+
+
+if __name__ == '__main__':
+    unittest.main()